@@ -14,6 +14,7 @@
 #include <csignal>
 #include <thread>
 #include <chrono>
+#include <cstring>
 
 using namespace rmc75e;
 
@@ -92,12 +93,32 @@ int main(int argc, char** argv) {
         std::cout << std::endl;
 
         // -----------------------------------------------------------------
-        // Example 4: Write a float register
+        // Example 4: Read several register ranges in one request
+        //   F57:30 to F57:31 and L57:32, batched into a single
+        //   Multiple Service Packet (one round-trip instead of two)
+        // -----------------------------------------------------------------
+        std::cout << "--- Example 4: Read several register ranges in one request ---" << std::endl;
+        {
+            auto raw = client.readMultiple({{57, 30, 2}, {57, 32, 1}});
+            float floats[2];
+            int32_t value;
+            std::memcpy(floats, raw[0].data(), sizeof(floats));
+            std::memcpy(&value, raw[1].data(), sizeof(value));
+            for (size_t i = 0; i < 2; i++) {
+                std::cout << "  F57:" << (30 + i) << " = " << std::fixed
+                          << std::setprecision(4) << floats[i] << std::endl;
+            }
+            std::cout << "  L57:32 = " << value << std::endl;
+        }
+        std::cout << std::endl;
+
+        // -----------------------------------------------------------------
+        // Example 5: Write a float register
         //   F57:33 = Variable 289
         //   Equivalent to: rmc.writeFloat(57, 33, [3.14])
         //   WARNING: This writes to the controller!
         // -----------------------------------------------------------------
-        std::cout << "--- Example 4: Write float register ---" << std::endl;
+        std::cout << "--- Example 5: Write float register ---" << std::endl;
         {
             std::vector<float> values = {3.14f};
             client.writeFloat(57, 33, values);
@@ -119,10 +140,10 @@ int main(int argc, char** argv) {
         std::cout << std::endl;
 
         // -----------------------------------------------------------------
-        // Example 5: Continuous monitoring
+        // Example 6: Continuous monitoring
         //   Poll L57:32 every second until Ctrl+C
         // -----------------------------------------------------------------
-        std::cout << "--- Example 5: Continuous monitoring (Ctrl+C to stop) ---" << std::endl;
+        std::cout << "--- Example 6: Continuous monitoring (Ctrl+C to stop) ---" << std::endl;
         std::cout << "  Polling L57:32 every second..." << std::endl;
         std::cout << std::endl;
 
@@ -10,11 +10,22 @@ Demonstrates reading and writing registers using the Register Map Object
 """
 
 import signal
+import struct
 import sys
+import threading
 import time
 
 from rmc75e import RMC75EClient
 
+# Implicit I/O (Example 7, enabled with --implicit). Set these to match the
+# I/O assemblies configured for the RMC75E in RMCTools.
+INPUT_ASSEMBLY = 100
+OUTPUT_ASSEMBLY = 150
+CONFIG_ASSEMBLY = 151
+INPUT_SIZE = 32
+OUTPUT_SIZE = 32
+RPI_MS = 100
+
 
 def main():
     print("========================================")
@@ -23,20 +34,21 @@ def main():
     print()
 
     # Configuration
+    args = [a for a in sys.argv[1:] if a != "--implicit"]
+    implicit = "--implicit" in sys.argv[1:]
     plc_address = "192.168.17.200"
-    if len(sys.argv) > 1:
-        plc_address = sys.argv[1]
+    if args:
+        plc_address = args[0]
 
     print(f"RMC75E address: {plc_address}")
     print()
 
-    # Create client and connect
-    client = RMC75EClient(plc_address)
-    client.connect()
-    print("Connected to RMC75E")
-    print()
+    # Create client and connect; the with block always disconnects,
+    # so the session cannot be leaked on errors
+    with RMC75EClient(plc_address) as client:
+        print("Connected to RMC75E")
+        print()
 
-    try:
         # -----------------------------------------------------------------
         # Example 1: Read a single float register
         #   F57:30 = Variable 286 current value
@@ -66,11 +78,26 @@ def main():
         print()
 
         # -----------------------------------------------------------------
-        # Example 4: Write a float register
+        # Example 4: Read several register ranges in one request
+        #   F57:30 to F57:31 and L57:32, batched into a single
+        #   Multiple Service Packet (one round-trip instead of two)
+        # -----------------------------------------------------------------
+        print("--- Example 4: Read several register ranges in one request ---")
+        floats, ints = client.read_multi([
+            (57, 30, "float", 2),
+            (57, 32, "int32", 1),
+        ])
+        for i, v in enumerate(floats):
+            print(f"  F57:{30 + i} = {v:.4f}")
+        print(f"  L57:32 = {ints[0]}")
+        print()
+
+        # -----------------------------------------------------------------
+        # Example 5: Write a float register
         #   F57:33 = Variable 289
         #   WARNING: This writes to the controller!
         # -----------------------------------------------------------------
-        print("--- Example 4: Write float register ---")
+        print("--- Example 5: Write float register ---")
         client.write_float(57, 33, [3.14])
         print("  Wrote F57:33 = 3.14")
 
@@ -85,33 +112,69 @@ def main():
         print()
 
         # -----------------------------------------------------------------
-        # Example 5: Continuous monitoring
-        #   Poll L57:32 every second until Ctrl+C
+        # Example 6: Continuous monitoring
+        #   Poll F57:30-31 and L57:32 every second until Ctrl+C, all
+        #   registers fetched in a single request per cycle
         # -----------------------------------------------------------------
-        print("--- Example 5: Continuous monitoring (Ctrl+C to stop) ---")
-        print("  Polling L57:32 every second...")
+        print("--- Example 6: Continuous monitoring (Ctrl+C to stop) ---")
+        print("  Polling F57:30-31 and L57:32 every second...")
         print()
 
-        keep_running = True
+        period = 1.0
+        stop = threading.Event()
 
         def signal_handler(signum, frame):
-            nonlocal keep_running
             print("\nInterrupt signal received. Stopping...")
-            keep_running = False
+            stop.set()
 
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
 
-        while keep_running:
-            values = client.read_int32(57, 32, 1)
-            print(f"  L57:32 = {values[0]}")
-            time.sleep(1)
+        # Absolute deadlines: the read latency does not accumulate as drift,
+        # and stop.wait() returns as soon as the signal handler fires.
+        next_deadline = time.monotonic()
+        while not stop.is_set():
+            floats, ints = client.read_multi([
+                (57, 30, "float", 2),
+                (57, 32, "int32", 1),
+            ])
+            print(f"  F57:30 = {floats[0]:.4f}  F57:31 = {floats[1]:.4f}  L57:32 = {ints[0]}")
+
+            # Skip missed cycles instead of bursting to catch up
+            next_deadline = max(next_deadline + period, time.monotonic())
+            if stop.wait(max(0.0, next_deadline - time.monotonic())):
+                break
 
-    finally:
-        # Disconnect
-        print()
-        client.disconnect()
-        print("Disconnected")
+        # -----------------------------------------------------------------
+        # Example 7: Implicit (Class 1) I/O, only with --implicit
+        #   The RMC75E pushes the input assembly every RPI; no request is
+        #   sent per sample. Runs until Ctrl+C.
+        # -----------------------------------------------------------------
+        if implicit:
+            print()
+            print("--- Example 7: Implicit I/O (Ctrl+C to stop) ---")
+            print(f"  Input assembly {INPUT_ASSEMBLY} every {RPI_MS} ms...")
+            print()
+
+            def on_input(data):
+                values = struct.unpack(f"<{len(data) // 4}i", data[:len(data) // 4 * 4])
+                print(f"  Input = {list(values)}")
+
+            stop.clear()
+            client.subscribe(on_input,
+                             input_assembly=INPUT_ASSEMBLY,
+                             output_assembly=OUTPUT_ASSEMBLY,
+                             config_assembly=CONFIG_ASSEMBLY,
+                             input_size=INPUT_SIZE,
+                             output_size=OUTPUT_SIZE,
+                             rpi_ms=RPI_MS)
+            while client.is_subscribed() and not stop.wait(0.5):
+                pass
+            client.unsubscribe()
+
+    # The with block has closed the session
+    print()
+    print("Disconnected")
 
     print()
     print("========================================")
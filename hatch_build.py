@@ -4,8 +4,19 @@ Custom build hook for hatchling.
 Forces the wheel to be tagged as platform-specific (not pure Python)
 since it contains pre-compiled C++ extensions (.so/.pyd) and shared
 libraries (.so/.dll) built by the scripts in scripts/.
+
+Also adds rmc75e/_platform.py with the platform facts of the target
+interpreter to standard wheels, so the package doesn't recompute them on
+every import. The file is generated in a temporary directory, never in the
+source tree, so a checkout shared between platforms can't pick up a stale one.
 """
 
+import os
+import shutil
+import sys
+import sysconfig
+import tempfile
+
 from hatchling.builders.hooks.plugin.interface import BuildHookInterface
 
 
@@ -13,3 +24,30 @@ class CustomBuildHook(BuildHookInterface):
     def initialize(self, version, build_data):
         build_data["pure_python"] = False
         build_data["infer_tag"] = True
+
+        # Editable installs import from src/ and compute the values at runtime
+        self._platform_dir = None
+        if version == "standard":
+            self._platform_dir = tempfile.mkdtemp(prefix="rmc75e_platform_")
+            path = self._write_platform_module(self._platform_dir)
+            build_data["force_include"][path] = "rmc75e/_platform.py"
+
+    def finalize(self, version, build_data, artifact_path):
+        if self._platform_dir is not None:
+            shutil.rmtree(self._platform_dir, ignore_errors=True)
+
+    @staticmethod
+    def _write_platform_module(directory):
+        """Write _platform.py for the interpreter running the build."""
+        ext_suffix = sysconfig.get_config_var("EXT_SUFFIX")
+        path = os.path.join(directory, "_platform.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                '"""Platform constants, generated by hatch_build.py at build time."""\n'
+                "\n"
+                f"IS_WIN = {sys.platform == 'win32'!r}\n"
+                f"IS_LINUX = {sys.platform == 'linux'!r}\n"
+                f"EXT_SUFFIX = {ext_suffix!r}\n"
+                'NATIVE_FILENAME = f"rmc75e{EXT_SUFFIX}"\n'
+            )
+        return path
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Builds EIPScanner and then the Python binding in a single process,
+sharing one BuildConfig between both steps.
+Usage: python scripts/build_all.py
+"""
+
+import sys
+from build_config import BuildConfig
+from build_eipscanner import build_eipscanner
+from build_binding import build_binding
+
+
+def build_all(cfg=None):
+    """Build EIPScanner and the Python binding."""
+    if cfg is None:
+        cfg = BuildConfig()
+
+    build_eipscanner(cfg)
+    build_binding(cfg)
+
+
+if __name__ == "__main__":
+    try:
+        build_all()
+    except Exception as e:
+        print(f"\nERROR: {e}")
+        sys.exit(1)
@@ -5,18 +5,47 @@ Requires EIPScanner to be already compiled.
 Usage: python scripts/build_binding.py
 """
 
+import functools
+import os
 import shutil
 import sys
+import sysconfig
 from build_config import BuildConfig, IS_WINDOWS, IS_LINUX
 
 
-def _build_binding_gcc(cfg, eip_include, ext_suffix):
-    """Build the Python binding using g++ directly (Linux)."""
+# Interpreter/pybind11 lookups are constant for the running Python, so they
+# are resolved once per process however many times a build step needs them.
+
+@functools.lru_cache(maxsize=None)
+def _ext_suffix():
+    """Extension module suffix of the running Python (e.g. .cpython-312-x86_64-linux-gnu.so)."""
+    return sysconfig.get_config_var('EXT_SUFFIX')
+
+
+@functools.lru_cache(maxsize=None)
+def _python_include():
+    """Python C headers directory."""
+    return sysconfig.get_path('include')
+
+
+@functools.lru_cache(maxsize=None)
+def _pybind_include():
+    """pybind11 headers directory."""
     import pybind11
-    import sysconfig
+    return pybind11.get_include()
 
-    python_include = sysconfig.get_path('include')
-    pybind_include = pybind11.get_include()
+
+@functools.lru_cache(maxsize=None)
+def _pybind_cmake_dir():
+    """pybind11 CMake package directory."""
+    import pybind11
+    return pybind11.get_cmake_dir()
+
+
+def _build_binding_gcc(cfg, eip_include, ext_suffix):
+    """Build the Python binding using g++ directly (Linux)."""
+    python_include = _python_include()
+    pybind_include = _pybind_include()
 
     output_name = cfg.src_dir / f"rmc75e{ext_suffix}"
 
@@ -27,6 +56,11 @@ def _build_binding_gcc(cfg, eip_include, ext_suffix):
     compile_cmd = [
         "g++",
         "-O3",
+        # LTO across bindings.cpp/RMC75EClient.cpp; hidden visibility keeps
+        # only PyInit_rmc75e exported (pybind11's recommended setting)
+        "-flto",
+        "-fvisibility=hidden",
+        "-fno-plt",
         "-Wall",
         "-shared",
         "-std=c++17",
@@ -45,6 +79,12 @@ def _build_binding_gcc(cfg, eip_include, ext_suffix):
         "-Wl,-rpath,$ORIGIN/lib",
     ]
 
+    # Wheels are tagged for the generic x86_64/aarch64 baseline, so tuning for
+    # the build machine's CPU is opt-in for local builds only
+    if os.environ.get("RMC75E_NATIVE_ARCH") == "1":
+        compile_cmd.insert(2, "-march=native")
+        print("Tuning for the build machine's CPU (-march=native)")
+
     print("\nCompiling...")
     cfg.run_command(compile_cmd)
 
@@ -65,8 +105,7 @@ def _build_binding_cmake(cfg, eip_include):
     shutil.copy2(cmake_template, cmake_dest)
 
     # Get pybind11 cmake directory
-    import pybind11
-    pybind11_cmake_dir = pybind11.get_cmake_dir()
+    pybind11_cmake_dir = _pybind_cmake_dir()
 
     print(f"pybind11 cmake dir: {pybind11_cmake_dir}")
     print(f"EIP include: {eip_include}")
@@ -101,9 +140,7 @@ def _build_binding_cmake(cfg, eip_include):
     ], cwd=binding_build_dir)
 
     # Verify output
-    import sysconfig
-    ext_suffix = sysconfig.get_config_var('EXT_SUFFIX')
-    expected_output = cfg.src_dir / f"rmc75e{ext_suffix}"
+    expected_output = cfg.src_dir / f"rmc75e{_ext_suffix()}"
 
     if not expected_output.exists():
         # On Windows, pybind11 may produce the file with .pyd extension
@@ -146,8 +183,7 @@ def build_binding(cfg=None):
             print(f"  Removing old binding: {old.name}")
             old.unlink()
 
-    import sysconfig
-    ext_suffix = sysconfig.get_config_var('EXT_SUFFIX')
+    ext_suffix = _ext_suffix()
     print(f"Extension suffix: {ext_suffix}")
 
     if IS_WINDOWS:
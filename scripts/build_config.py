@@ -3,26 +3,33 @@
 Shared configuration and utilities for build scripts.
 """
 
+import collections
+import functools
 import os
 import platform
+import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
 IS_WINDOWS = sys.platform == "win32"
-IS_LINUX = sys.platform.startswith("linux")
+IS_LINUX = sys.platform == "linux"
 
 
+_VERSION_RE = re.compile(r"""^__version__\s*=\s*(['"])([^'"]+)\1""", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=None)
 def get_project_version():
     """Read the project version from src/rmc75e/__about__.py."""
     about_file = Path.cwd() / "src" / "rmc75e" / "__about__.py"
-    with open(about_file) as f:
-        for line in f:
-            if line.startswith("__version__"):
-                return line.split("=")[1].strip().strip('"').strip("'")
-    raise RuntimeError("Version not found in src/rmc75e/__about__.py")
+    match = _VERSION_RE.search(about_file.read_text(encoding="utf-8"))
+    if match is None:
+        raise RuntimeError("Version not found in src/rmc75e/__about__.py")
+    return match.group(2)
 
 
 class BuildConfig:
@@ -41,26 +48,33 @@ class BuildConfig:
         self.deps_dir.mkdir(parents=True, exist_ok=True)
 
     def run_command(self, cmd, cwd=None, env=None):
-        """Run a shell command."""
-        print(f"\n>  {' '.join(str(c) for c in cmd)}")
+        """Run a shell command, streaming its output as it runs."""
+        print(f"\n>  {' '.join(str(c) for c in cmd)}", flush=True)
 
-        result = subprocess.run(
+        # Forward output line by line; keep only a tail for the error report
+        tail = collections.deque(maxlen=200)
+        with subprocess.Popen(
             cmd,
             cwd=cwd or self.root_dir,
             env=env or os.environ.copy(),
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode != 0:
-            print(f"STDOUT: {result.stdout}")
-            print(f"STDERR: {result.stderr}")
-            raise RuntimeError(f"Command failed: {' '.join(str(c) for c in cmd)}")
-
-        if result.stdout:
-            print(result.stdout)
-
-        return result
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            bufsize=1,
+        ) as proc:
+            for line in proc.stdout:
+                sys.stdout.write(line)
+                tail.append(line)
+            returncode = proc.wait()
+
+        sys.stdout.flush()
+        if returncode != 0:
+            raise RuntimeError(
+                f"Command failed: {' '.join(str(c) for c in cmd)}\n"
+                f"Last output:\n{''.join(tail)}")
+
+        return subprocess.CompletedProcess(cmd, returncode, stdout="".join(tail))
 
     def cmake_build(self, build_dir, config="Release"):
         """Build with cmake (cross-platform: make on Linux, msbuild on Windows)."""
@@ -75,7 +89,8 @@ class BuildConfig:
 
     def copy_shared_libs(self, search_dirs, pattern_base):
         """Copy shared libraries to lib_dir. Returns number of files copied."""
-        copied = 0
+        # Collect (source, symlink target or None) in one pass, then copy
+        copies = []
 
         if IS_WINDOWS:
             # On Windows, search for .dll and .lib in Release/ subdirectories too
@@ -89,41 +104,48 @@ class BuildConfig:
             for search_dir in all_search_dirs:
                 if not search_dir.exists():
                     continue
-                # Copy .dll
-                for lib_file in search_dir.glob(f"{pattern_base}*.dll"):
-                    if lib_file.is_file():
-                        dst = self.lib_dir / lib_file.name
-                        print(f"  + {lib_file.name} -> {dst.relative_to(self.root_dir)}")
-                        shutil.copy2(lib_file, dst)
-                        copied += 1
-                # Copy .lib (import libraries for linking)
-                for lib_file in search_dir.glob(f"{pattern_base}*.lib"):
-                    if lib_file.is_file():
-                        dst = self.lib_dir / lib_file.name
-                        print(f"  + {lib_file.name} -> {dst.relative_to(self.root_dir)}")
-                        shutil.copy2(lib_file, dst)
-                        copied += 1
+                # .dll, and .lib (import libraries for linking)
+                for ext in ("dll", "lib"):
+                    for lib_file in search_dir.glob(f"{pattern_base}*.{ext}"):
+                        if lib_file.is_file():
+                            copies.append((lib_file, None))
         else:
             # Linux: copy .so and symlinks
             for search_dir in search_dirs:
                 if not search_dir.exists():
                     continue
-                # Real files first
-                for lib_file in search_dir.glob(f"{pattern_base}*.so*"):
-                    if lib_file.is_file() and not lib_file.is_symlink():
-                        dst = self.lib_dir / lib_file.name
-                        print(f"  + {lib_file.name} -> {dst.relative_to(self.root_dir)}")
-                        shutil.copy2(lib_file, dst)
-                        copied += 1
-                # Then symlinks
                 for lib_file in search_dir.glob(f"{pattern_base}*.so*"):
                     if lib_file.is_symlink():
-                        link_target = lib_file.readlink()
-                        dst = self.lib_dir / lib_file.name
-                        if dst.exists():
-                            dst.unlink()
-                        dst.symlink_to(link_target.name)
-                        print(f"  + {lib_file.name} -> {link_target.name} (symlink)")
-                        copied += 1
-
-        return copied
+                        copies.append((lib_file, lib_file.readlink()))
+                    elif lib_file.is_file():
+                        copies.append((lib_file, None))
+
+        # Only orders the log output (real files, then symlinks): the copies
+        # themselves run concurrently, and a symlink doesn't need its target
+        # to exist when it is created
+        copies.sort(key=lambda item: item[1] is not None)
+        for lib_file, link_target in copies:
+            dst = self.lib_dir / lib_file.name
+            if link_target is None:
+                print(f"  + {lib_file.name} -> {dst.relative_to(self.root_dir)}")
+            else:
+                print(f"  + {lib_file.name} -> {link_target.name} (symlink)")
+
+        # Copies are I/O bound and release the GIL: run them concurrently
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(self._copy_shared_lib, copies))
+
+        return len(copies)
+
+    def _copy_shared_lib(self, item):
+        """Copy one library (or recreate one symlink) into lib_dir."""
+        lib_file, link_target = item
+        dst = self.lib_dir / lib_file.name
+        if link_target is not None:
+            if dst.exists() or dst.is_symlink():
+                dst.unlink()
+            dst.symlink_to(link_target.name)
+        else:
+            # copyfile uses the kernel fast-copy path (sendfile/copy_file_range)
+            shutil.copyfile(lib_file, dst)
+            shutil.copystat(lib_file, dst)
@@ -4,10 +4,60 @@ Builds EIPScanner from source.
 Usage: python scripts/build_eipscanner.py
 """
 
+import hashlib
+import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from build_config import BuildConfig, IS_WINDOWS, IS_LINUX
 
 
+# Unguarded POSIX includes (headers that don't exist on Windows), one
+# compiled pattern for all of them. Matches the line without its terminator.
+_POSIX_INCLUDE_RE = re.compile(
+    rb"^[ \t]*#include[ \t]*<(?:sys/socket\.h|netinet/in\.h|arpa/inet\.h|unistd\.h|netdb\.h)>"
+    rb"[ \t]*(?=\r?$)",
+    re.MULTILINE,
+)
+
+# Preprocessor lines meaning the following include is already platform-guarded
+_WIN32_GUARD_RE = re.compile(
+    rb"#(?:ifdef _WIN32|ifndef _WIN32|else|if defined\(_WIN32\)|if !defined\(_WIN32\))"
+)
+
+
+def _guard_posix_includes(fpath):
+    """Wrap the unguarded POSIX includes of one file in #ifndef _WIN32.
+
+    Returns True if the file was modified.
+    """
+    try:
+        content = fpath.read_bytes()
+    except OSError:
+        return False
+
+    newline = b"\r\n" if b"\r\n" in content else b"\n"
+    patched = bytearray()
+    pos = 0
+    for match in _POSIX_INCLUDE_RE.finditer(content):
+        # Previous non-empty line (a short look-behind window is enough)
+        window = content[max(0, match.start() - 256):match.start()]
+        prev_line = window.rstrip().rsplit(b"\n", 1)[-1].strip()
+        if _WIN32_GUARD_RE.match(prev_line):
+            continue
+
+        patched += content[pos:match.start()]
+        patched += b"#ifndef _WIN32" + newline + match.group(0) + newline + b"#endif"
+        pos = match.end()
+
+    if pos == 0:
+        return False
+
+    patched += content[pos:]
+    fpath.write_bytes(bytes(patched))
+    return True
+
+
 def _patch_eipscanner_for_windows(cfg, eip_dir):
     """Apply patches to EIPScanner for Windows MSVC compatibility.
 
@@ -17,61 +67,14 @@ def _patch_eipscanner_for_windows(cfg, eip_dir):
     print("\nApplying Windows patches...")
     patches_applied = 0
 
-    # POSIX headers that don't exist on Windows
-    posix_headers = [
-        "sys/socket.h", "netinet/in.h", "arpa/inet.h",
-        "unistd.h", "netdb.h",
-    ]
-
     source_files = list(eip_dir.rglob("*.cpp")) + list(eip_dir.rglob("*.h"))
 
-    for fpath in source_files:
-        try:
-            content = fpath.read_text(encoding="utf-8", errors="replace")
-        except Exception:
-            continue
-
-        lines = content.split('\n')
-        new_lines = []
-        changed = False
-
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            stripped = line.strip()
-
-            # Check if this line is a POSIX include that needs a guard
-            needs_guard = False
-            for hdr in posix_headers:
-                if stripped == f'#include <{hdr}>':
-                    # Check if already inside a platform guard
-                    prev_stripped = ""
-                    for j in range(len(new_lines) - 1, -1, -1):
-                        prev_stripped = new_lines[j].strip()
-                        if prev_stripped:
-                            break
-                    already_guarded = (
-                        prev_stripped.startswith("#ifdef _WIN32") or
-                        prev_stripped.startswith("#ifndef _WIN32") or
-                        prev_stripped.startswith("#else") or
-                        prev_stripped.startswith("#if defined(_WIN32)") or
-                        prev_stripped.startswith("#if !defined(_WIN32)")
-                    )
-                    if not already_guarded:
-                        needs_guard = True
-                    break
-
-            if needs_guard:
-                new_lines.append("#ifndef _WIN32")
-                new_lines.append(line)
-                new_lines.append("#endif")
-                changed = True
-            else:
-                new_lines.append(line)
-            i += 1
+    # Files are independent: scan and patch them in parallel
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        results = list(pool.map(_guard_posix_includes, source_files))
 
+    for fpath, changed in zip(source_files, results):
         if changed:
-            fpath.write_text('\n'.join(new_lines), encoding="utf-8")
             patches_applied += 1
             print(f"  Patched: {fpath.relative_to(eip_dir)}")
 
@@ -92,6 +95,127 @@ def _patch_eipscanner_for_windows(cfg, eip_dir):
     print(f"  {patches_applied} file(s) patched")
 
 
+# TCP socket creation in EIPScanner's TCPSocket constructor, followed by its
+# "if (fd < 0) throw ..." check (braced or not), when present
+_TCP_SOCKET_RE = re.compile(
+    r"^([ \t]*)(\w+)\s*=\s*socket\(\s*AF_INET\s*,\s*SOCK_STREAM\s*,\s*IPPROTO_TCP\s*\);[^\n]*"
+    r"(?:\n[ \t]*if\s*\(\s*\2\s*<\s*0\s*\)\s*(?:\{[^}]*\}|[^;{]*;)[^\n]*)?$",
+    re.MULTILINE,
+)
+
+
+def _patch_eipscanner_tcp_nodelay(cfg, eip_dir):
+    """Enable TCP_NODELAY on EIPScanner's explicit messaging socket.
+
+    Requests and replies are small, single-segment messages: with Nagle's
+    algorithm a request can sit in the send buffer waiting for the ACK of
+    the previous one (delayed by up to ~40 ms on the RMC side). EIPScanner
+    doesn't expose the socket, so the option is set where it is created,
+    after the creation error check: a setsockopt() on the invalid socket
+    would overwrite errno / WSAGetLastError() before the check reports it.
+    """
+    print("\nApplying TCP_NODELAY patch...")
+    tcp_socket = eip_dir / "src" / "sockets" / "TCPSocket.cpp"
+    if not tcp_socket.exists():
+        print(f"  WARNING: {tcp_socket.relative_to(eip_dir)} not found, skipping")
+        return
+
+    content = tcp_socket.read_text(encoding="utf-8")
+    if "TCP_NODELAY" in content:
+        print("  Already patched")
+        return
+
+    def set_nodelay(match):
+        indent, fd = match.group(1), match.group(2)
+        return (
+            f"{match.group(0)}\n"
+            f"{indent}{{\n"
+            f"{indent}\t// rmc75e: disable Nagle for small request/response traffic\n"
+            f"{indent}\tint noDelay = 1;\n"
+            f"{indent}\tsetsockopt({fd}, IPPROTO_TCP, TCP_NODELAY,\n"
+            f"{indent}\t\treinterpret_cast<const char*>(&noDelay), sizeof(noDelay));\n"
+            f"{indent}}}"
+        )
+
+    content, count = _TCP_SOCKET_RE.subn(set_nodelay, content)
+    if count == 0:
+        print("  WARNING: socket() call not found in TCPSocket.cpp, skipping")
+        return
+
+    # TCP_NODELAY comes from <netinet/tcp.h> on POSIX (winsock2.h on Windows)
+    content = "#ifndef _WIN32\n#include <netinet/tcp.h>\n#endif\n" + content
+    tcp_socket.write_text(content, encoding="utf-8")
+    print(f"  Patched: {tcp_socket.relative_to(eip_dir)} ({count} socket(s))")
+
+
+# Body of EIPScanner's SessionInfo destructor (no nested braces)
+_SESSION_DTOR_RE = re.compile(r"(SessionInfo::~SessionInfo\(\)\s*\{)([^{}]*?)(\n[ \t]*\})")
+
+
+def _patch_eipscanner_session_close(cfg, eip_dir):
+    """Make ~SessionInfo ignore a failed UnRegisterSession send.
+
+    The destructor sends UnRegisterSession, and TCPSocket::Send throws
+    std::system_error when the socket has failed (connection reset, broken
+    pipe). An exception leaving a destructor calls std::terminate, which would
+    kill the interpreter when RMC75EClient replaces a lost session. The
+    session's socket is closed either way.
+    """
+    print("\nApplying SessionInfo close patch...")
+    session_info = eip_dir / "src" / "SessionInfo.cpp"
+    if not session_info.exists():
+        print(f"  WARNING: {session_info.relative_to(eip_dir)} not found, skipping")
+        return
+
+    content = session_info.read_text(encoding="utf-8")
+    if "rmc75e: UnRegisterSession" in content:
+        print("  Already patched")
+        return
+
+    def guard_body(match):
+        body = match.group(2).strip("\n").rstrip()
+        indented = "\n".join(f"\t{line}" if line.strip() else line for line in body.split("\n"))
+        indent = re.match(r"[ \t]*", body).group(0)
+        return (
+            f"{match.group(1)}\n"
+            f"{indent}// rmc75e: UnRegisterSession on a failed socket must not throw\n"
+            f"{indent}try {{\n"
+            f"{indented}\n"
+            f"{indent}}} catch (const std::exception& e) {{\n"
+            f"{indent}\teipScanner::utils::Logger(eipScanner::utils::LogLevel::WARNING)\n"
+            f"{indent}\t\t<< \"Failed to unregister session: \" << e.what();\n"
+            f"{indent}}}"
+            f"{match.group(3)}"
+        )
+
+    content, count = _SESSION_DTOR_RE.subn(guard_body, content)
+    if count == 0:
+        print("  WARNING: ~SessionInfo not found in SessionInfo.cpp, skipping")
+        return
+
+    content = "#include <exception>\n#include \"utils/Logger.h\"\n" + content
+    session_info.write_text(content, encoding="utf-8")
+    print(f"  Patched: {session_info.relative_to(eip_dir)}")
+
+
+def _source_fingerprint(eip_dir, cmake_args):
+    """Hash of the EIPScanner sources (after patching) and the CMake options.
+
+    Uses path, size and mtime of every source file rather than contents:
+    patches and checkouts always touch the mtime of the files they change.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\0".join(cmake_args).encode())
+    for root, dirs, files in os.walk(eip_dir):
+        # Skip the build tree and git metadata; walk in a stable order
+        dirs[:] = sorted(d for d in dirs if d not in ("build", ".git"))
+        for name in sorted(files):
+            st = os.stat(os.path.join(root, name))
+            rel = os.path.relpath(os.path.join(root, name), eip_dir)
+            digest.update(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
 def build_eipscanner(cfg=None):
     """Build EIPScanner"""
     if cfg is None:
@@ -110,19 +234,20 @@ def build_eipscanner(cfg=None):
         cfg.run_command([
             "git", "clone",
             "--depth", "1",
+            "--single-branch",
+            "--filter=blob:none",
             "https://github.com/nimbuscontrols/EIPScanner.git",
             str(eip_dir)
         ])
     else:
         print("EIPScanner already exists, skipping clone")
 
-    # Apply Windows patches if needed
+    # Apply patches
+    _patch_eipscanner_tcp_nodelay(cfg, eip_dir)
+    _patch_eipscanner_session_close(cfg, eip_dir)
     if IS_WINDOWS:
         _patch_eipscanner_for_windows(cfg, eip_dir)
 
-    # Build
-    eip_build_dir.mkdir(exist_ok=True)
-
     cmake_args = [
         "cmake", "..",
         "-DCMAKE_BUILD_TYPE=Release",
@@ -132,6 +257,28 @@ def build_eipscanner(cfg=None):
 
     if IS_WINDOWS:
         cmake_args.append("-DCMAKE_WINDOWS_EXPORT_ALL_SYMBOLS=ON")
+    else:
+        # Link-time optimization inside libEIPScanner (request encode/decode,
+        # socket I/O). Not on MSVC: /GL objects break WINDOWS_EXPORT_ALL_SYMBOLS.
+        # CMP0069=NEW makes CMake honour the setting whatever
+        # cmake_minimum_required EIPScanner declares.
+        cmake_args += [
+            "-DCMAKE_INTERPROCEDURAL_OPTIMIZATION=ON",
+            "-DCMAKE_POLICY_DEFAULT_CMP0069=NEW",
+        ]
+
+    # Skip the build if the libraries in lib_dir come from these exact sources
+    # and options (EIPScanner doesn't depend on the Python version)
+    lib_pattern = "libEIPScanner*.so*" if IS_LINUX else "EIPScanner*.dll"
+    stamp_file = eip_build_dir / ".rmc75e_build.stamp"
+    fingerprint = _source_fingerprint(eip_dir, cmake_args)
+    if (any(cfg.lib_dir.glob(lib_pattern)) and stamp_file.exists()
+            and stamp_file.read_text().strip() == fingerprint):
+        print("OK EIPScanner is up to date, skipping build")
+        return
+
+    # Build
+    eip_build_dir.mkdir(exist_ok=True)
 
     print("\nConfiguring EIPScanner with CMake...")
     cfg.run_command(cmake_args, cwd=eip_build_dir)
@@ -151,6 +298,7 @@ def build_eipscanner(cfg=None):
             print(f"  Found: {item}")
         raise RuntimeError("No compiled EIPScanner libraries found")
 
+    stamp_file.write_text(fingerprint + "\n")
     print(f"OK EIPScanner built - {copied} file(s) copied")
 
 
@@ -12,25 +12,91 @@ Usage:
   python scripts/build_wheels.py                   # All platforms (Windows + Linux)
   python scripts/build_wheels.py --platform linux   # Linux only (x64 + arm)
   python scripts/build_wheels.py --platform windows # Windows only
+  python scripts/build_wheels.py --serial           # All platforms, one after another
 
-Wheels are output to dist/. Then publish with:
+With several platforms, the builds run concurrently (Linux in Docker, Windows
+with MSVC), each from its own temporary copy of the source tree: their
+before-all steps clean and rebuild build/ and src/rmc75e/ in place. Each one
+logs to dist/build_<platform>.log and the end of the log is printed when it
+finishes.
+
+Wheels are output to dist/ in the project root, whatever the current directory.
+Then publish with:
   hatch publish
 """
 
 import argparse
+import shutil
 import subprocess
 import sys
+import tempfile
+from collections import deque
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DIST_DIR = ROOT_DIR / "dist"
+LOG_TAIL_LINES = 30
+
+# Not copied into the per-platform source trees: VCS data, build outputs
+# (recreated by before-all) and local environments
+_COPY_IGNORE = shutil.ignore_patterns(
+    ".git", "build", "dist", "__pycache__", "*.egg-info", ".venv", "venv",
+    "rmc75e*.so", "rmc75e*.pyd", "lib",
+)
+
+
+def _cibuildwheel_cmd(platform):
+    return [sys.executable, "-m", "cibuildwheel", "--output-dir", str(DIST_DIR),
+            "--platform", platform]
+
+
+def _copy_source_tree(platform):
+    """Copy the project to a temporary directory for one platform's build."""
+    src_dir = Path(tempfile.mkdtemp(prefix=f"rmc75e_{platform}_")) / "rmc75e"
+    shutil.copytree(ROOT_DIR, src_dir, ignore=_COPY_IGNORE)
+    return src_dir
 
 
 def run_cibuildwheel(platform):
     """Run cibuildwheel for a specific platform. Returns exit code."""
-    cmd = [sys.executable, "-m", "cibuildwheel", "--output-dir", "dist",
-           "--platform", platform]
+    cmd = _cibuildwheel_cmd(platform)
     print(f"\n{'='*60}")
     print(f"  Building wheels for: {platform}")
     print(f"{'='*60}\n")
     print(f"Running: {' '.join(cmd)}\n")
-    return subprocess.run(cmd).returncode
+    return subprocess.run(cmd, cwd=ROOT_DIR).returncode
+
+
+def run_cibuildwheel_concurrently(platforms):
+    """Run cibuildwheel for all platforms at once. Returns {platform: exit code}."""
+    DIST_DIR.mkdir(exist_ok=True)
+
+    running = []
+    for platform in platforms:
+        cmd = _cibuildwheel_cmd(platform)
+        src_dir = _copy_source_tree(platform)
+        log_path = DIST_DIR / f"build_{platform}.log"
+        log_file = open(log_path, "w")
+        print(f"Started {platform}: {' '.join(cmd)}")
+        print(f"  Source: {src_dir}")
+        print(f"  Log: {log_path}")
+        proc = subprocess.Popen(cmd, cwd=src_dir, stdout=log_file, stderr=subprocess.STDOUT)
+        running.append((platform, proc, log_file, log_path, src_dir))
+
+    results = {}
+    for platform, proc, log_file, log_path, src_dir in running:
+        results[platform] = proc.wait()
+        log_file.close()
+        shutil.rmtree(src_dir.parent, ignore_errors=True)
+
+        with open(log_path, errors="replace") as f:
+            tail = deque(f, maxlen=LOG_TAIL_LINES)
+        print(f"\n{'='*60}")
+        print(f"  {platform}: exit code {results[platform]} (last lines of {log_path})")
+        print(f"{'='*60}")
+        print("".join(tail), end="")
+
+    return results
 
 
 def main():
@@ -41,6 +107,11 @@ def main():
         default="all",
         help="Target platform (default: all)",
     )
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help="Build platforms one after another, with live output",
+    )
     args = parser.parse_args()
 
     # Check cibuildwheel is installed
@@ -55,9 +126,13 @@ def main():
     else:
         platforms = [args.platform]
 
+    if args.serial or len(platforms) == 1:
+        results = {platform: run_cibuildwheel(platform) for platform in platforms}
+    else:
+        results = run_cibuildwheel_concurrently(platforms)
+
     failed = []
-    for platform in platforms:
-        rc = run_cibuildwheel(platform)
+    for platform, rc in results.items():
         if rc != 0:
             failed.append(platform)
             print(f"\nBuild FAILED for {platform}", file=sys.stderr)
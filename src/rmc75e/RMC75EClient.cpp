@@ -1,10 +1,12 @@
 #include "RMC75EClient.h"
 #include "cip/EPath.h"
 #include "cip/GeneralStatusCodes.h"
+#include "cip/connectionManager/NetworkConnectionParams.h"
 #include "utils/Logger.h"
 #include <sstream>
 #include <iomanip>
 #include <stdexcept>
+#include <system_error>
 #include <cstring>
 
 #ifdef _WIN32
@@ -14,8 +16,12 @@
 using namespace rmc75e;
 using namespace eipScanner;
 using namespace eipScanner::cip;
+using namespace eipScanner::cip::connectionManager;
 using namespace eipScanner::utils;
 
+/// Client whose ioLoop() runs on the current thread (set on I/O threads only)
+static thread_local const RMC75EClient* currentIoClient = nullptr;
+
 RMC75EClient::RMC75EClient(const std::string& plcAddress, uint16_t port)
     : plcAddress_(plcAddress)
     , port_(port)
@@ -37,11 +43,16 @@ RMC75EClient::~RMC75EClient() {
 }
 
 void RMC75EClient::connect() {
+    std::lock_guard<std::mutex> lock(sessionMutex_);
     if (sessionInfo_) {
         Logger(LogLevel::WARNING) << "Already connected";
         return;
     }
 
+    openSession();
+}
+
+void RMC75EClient::openSession() {
     try {
         sessionInfo_ = std::make_shared<SessionInfo>(plcAddress_, port_);
         Logger(LogLevel::INFO) << "Connected to RMC75E at " << plcAddress_;
@@ -52,6 +63,9 @@ void RMC75EClient::connect() {
 }
 
 void RMC75EClient::disconnect() {
+    unsubscribe();
+
+    std::lock_guard<std::mutex> lock(sessionMutex_);
     if (sessionInfo_) {
         Logger(LogLevel::INFO) << "Disconnecting from RMC75E";
         sessionInfo_.reset();
@@ -59,6 +73,7 @@ void RMC75EClient::disconnect() {
 }
 
 bool RMC75EClient::isConnected() const {
+    std::lock_guard<std::mutex> lock(sessionMutex_);
     return sessionInfo_ != nullptr;
 }
 
@@ -68,7 +83,7 @@ bool RMC75EClient::isConnected() const {
 
 std::vector<float> RMC75EClient::readFloat(uint16_t file, uint16_t element, uint16_t count) {
     auto payload = buildReadPayload(file, element, count);
-    auto raw = executeRequest(SVC_READ_LSB, payload);
+    auto raw = executeRequest(SVC_READ_LSB, payload, true);
 
     if (raw.size() < count * 4) {
         std::ostringstream ss;
@@ -86,7 +101,7 @@ std::vector<float> RMC75EClient::readFloat(uint16_t file, uint16_t element, uint
 
 void RMC75EClient::writeFloat(uint16_t file, uint16_t element, const std::vector<float>& values) {
     auto payload = buildWritePayload(file, element, values.data(), static_cast<uint16_t>(values.size()));
-    executeRequest(SVC_WRITE_LSB, payload);
+    executeRequest(SVC_WRITE_LSB, payload, false);
 
     Logger(LogLevel::DEBUG) << "writeFloat F" << file << ":" << element
                             << " count=" << values.size() << " OK";
@@ -94,7 +109,7 @@ void RMC75EClient::writeFloat(uint16_t file, uint16_t element, const std::vector
 
 std::vector<int32_t> RMC75EClient::readInt32(uint16_t file, uint16_t element, uint16_t count) {
     auto payload = buildReadPayload(file, element, count);
-    auto raw = executeRequest(SVC_READ_LSB, payload);
+    auto raw = executeRequest(SVC_READ_LSB, payload, true);
 
     if (raw.size() < count * 4) {
         std::ostringstream ss;
@@ -112,14 +127,232 @@ std::vector<int32_t> RMC75EClient::readInt32(uint16_t file, uint16_t element, ui
 
 void RMC75EClient::writeInt32(uint16_t file, uint16_t element, const std::vector<int32_t>& values) {
     auto payload = buildWritePayload(file, element, values.data(), static_cast<uint16_t>(values.size()));
-    executeRequest(SVC_WRITE_LSB, payload);
+    executeRequest(SVC_WRITE_LSB, payload, false);
 
     Logger(LogLevel::DEBUG) << "writeInt32 L" << file << ":" << element
                             << " count=" << values.size() << " OK";
 }
 
+std::vector<std::vector<uint8_t>> RMC75EClient::readMultiple(const std::vector<RegisterRange>& ranges) {
+    if (ranges.empty()) {
+        return {};
+    }
+
+    // Embedded request path: class 0xC0, instance 0x01 (8-bit segments, 2 words)
+    const uint8_t path[] = {
+        0x20, static_cast<uint8_t>(REGISTER_MAP_CLASS),
+        0x24, static_cast<uint8_t>(REGISTER_MAP_INSTANCE),
+    };
+
+    // Multiple Service Packet: count(2) + offsets(2*N) + embedded requests.
+    // Offsets are relative to the start of the count field and 16-bit, so
+    // the whole packet must fit in 0xFFFF bytes.
+    const size_t n = ranges.size();
+    const size_t requestSize = 2 + sizeof(path) + 6;
+    const size_t payloadSize = 2 + 2 * n + requestSize * n;
+    if (payloadSize > 0xFFFF) {
+        std::ostringstream ss;
+        ss << "readMultiple: too many ranges (" << n << "), the request would be "
+           << payloadSize << " bytes (max 65535)";
+        throw std::invalid_argument(ss.str());
+    }
+    std::vector<uint8_t> payload(payloadSize);
+    payload[0] = static_cast<uint8_t>(n & 0xFF);
+    payload[1] = static_cast<uint8_t>(n >> 8);
+
+    for (size_t i = 0; i < n; i++) {
+        size_t offset = 2 + 2 * n + requestSize * i;
+        payload[2 + 2 * i] = static_cast<uint8_t>(offset & 0xFF);
+        payload[3 + 2 * i] = static_cast<uint8_t>(offset >> 8);
+
+        auto body = buildReadPayload(ranges[i].file, ranges[i].element, ranges[i].count);
+        payload[offset] = SVC_READ_LSB;
+        payload[offset + 1] = static_cast<uint8_t>(sizeof(path) / 2);
+        std::memcpy(payload.data() + offset + 2, path, sizeof(path));
+        std::memcpy(payload.data() + offset + 2 + sizeof(path), body.data(), body.size());
+    }
+
+    auto response = sendRequest(SVC_MULTIPLE_SERVICE,
+                                EPath(MESSAGE_ROUTER_CLASS, MESSAGE_ROUTER_INSTANCE),
+                                payload, true);
+    // 0x1E (embedded service error) still carries every embedded reply:
+    // the failing request is reported below with its own status
+    auto generalStatus = static_cast<uint8_t>(response.getGeneralStatusCode());
+    if (generalStatus != GeneralStatusCodes::SUCCESS &&
+        generalStatus != STATUS_EMBEDDED_SERVICE_ERROR) {
+        throwStatusError(SVC_MULTIPLE_SERVICE, response);
+    }
+    const auto& raw = response.getData();
+
+    // Response: count(2) + offsets(2*N) + replies, each reply being
+    // service(1) + reserved(1) + status(1) + additional size(1) + additional(2*k) + data
+    auto readU16 = [&raw](size_t pos) -> size_t {
+        return static_cast<size_t>(raw[pos]) | (static_cast<size_t>(raw[pos + 1]) << 8);
+    };
+
+    if (raw.size() < 2 || readU16(0) != n || raw.size() < 2 + 2 * n) {
+        throw std::runtime_error("readMultiple: malformed Multiple Service Packet response");
+    }
+
+    std::vector<std::vector<uint8_t>> result(n);
+    for (size_t i = 0; i < n; i++) {
+        size_t start = readU16(2 + 2 * i);
+        size_t end = (i + 1 < n) ? readU16(2 + 2 * (i + 1)) : raw.size();
+        if (start + 4 > end || end > raw.size()) {
+            throw std::runtime_error("readMultiple: malformed embedded reply");
+        }
+
+        uint8_t status = raw[start + 2];
+        size_t dataStart = start + 4 + 2 * static_cast<size_t>(raw[start + 3]);
+        if (status != GeneralStatusCodes::SUCCESS) {
+            std::ostringstream ss;
+            ss << "readMultiple: request " << i << " (" << ranges[i].file << ":"
+               << ranges[i].element << ") failed with status=0x" << std::hex << (int)status;
+            throw std::runtime_error(ss.str());
+        }
+        if (dataStart > end || end - dataStart < static_cast<size_t>(ranges[i].count) * 4) {
+            std::ostringstream ss;
+            ss << "readMultiple: request " << i << " expected " << ranges[i].count * 4
+               << " bytes, got " << (dataStart > end ? 0 : end - dataStart);
+            throw std::runtime_error(ss.str());
+        }
+
+        result[i].assign(raw.begin() + dataStart,
+                         raw.begin() + dataStart + ranges[i].count * 4);
+    }
+
+    Logger(LogLevel::DEBUG) << "readMultiple ranges=" << n << " OK";
+    return result;
+}
+
+// ---------------------------------------------------------------------------
+// Implicit messaging (Class 1 I/O)
+// ---------------------------------------------------------------------------
+
+void RMC75EClient::subscribe(const ImplicitConnectionConfig& config, InputDataListener listener) {
+    if (!isConnected()) {
+        throw std::runtime_error("Not connected - call connect() first");
+    }
+    if (currentIoClient == this) {
+        throw std::runtime_error("subscribe() can't be called from the listener");
+    }
+
+    // Declared before the lock: a reaped connection is destroyed after it
+    std::shared_ptr<IOConnection> previous;
+    std::lock_guard<std::mutex> ioLock(ioMutex_);
+    if (ioRunning_) {
+        throw std::runtime_error("Already subscribed - call unsubscribe() first");
+    }
+    // Reap a previous connection that was closed by the RMC
+    previous = stopIo();
+
+    ConnectionParameters parameters;
+    // Application path: configuration, output (O->T) and input (T->O) assemblies
+    parameters.connectionPath = {
+        0x20, 0x04,
+        0x24, config.configAssembly,
+        0x2C, config.outputAssembly,
+        0x2C, config.inputAssembly,
+    };
+    parameters.o2tRealTimeFormat = true;
+    parameters.t2oNetworkConnectionParams |= NetworkConnectionParams::P2P;
+    parameters.t2oNetworkConnectionParams |= NetworkConnectionParams::SCHEDULED_PRIORITY;
+    parameters.t2oNetworkConnectionParams |= config.inputSize;
+    parameters.o2tNetworkConnectionParams |= NetworkConnectionParams::P2P;
+    parameters.o2tNetworkConnectionParams |= NetworkConnectionParams::SCHEDULED_PRIORITY;
+    parameters.o2tNetworkConnectionParams |= config.outputSize;
+    parameters.o2tRPI = config.rpiMs * 1000;
+    parameters.t2oRPI = config.rpiMs * 1000;
+    parameters.transportTypeTrigger |= NetworkConnectionParams::CLASS1;
+
+    IOConnection::WPtr io;
+    {
+        std::lock_guard<std::mutex> lock(sessionMutex_);
+        if (!sessionInfo_) {
+            throw std::runtime_error("Not connected - call connect() first");
+        }
+        io = connectionManager_.forwardOpen(sessionInfo_, parameters);
+    }
+    auto ioPtr = io.lock();
+    if (!ioPtr) {
+        throw std::runtime_error("Forward Open to RMC75E at " + plcAddress_ + " failed");
+    }
+
+    ioPtr->setDataToSend(std::vector<uint8_t>(config.outputSize));
+    ioPtr->setReceiveDataListener(
+        [listener](CipUdint, CipUint, const std::vector<uint8_t>& data) {
+            listener(data);
+        });
+    ioPtr->setCloseListener([]() {
+        Logger(LogLevel::INFO) << "Implicit connection closed";
+    });
+
+    ioConnection_ = io;
+    ioRunning_ = true;
+    ioThread_ = std::thread(&RMC75EClient::ioLoop, this);
+
+    Logger(LogLevel::INFO) << "Implicit connection opened: input=" << (int)config.inputAssembly
+                           << " output=" << (int)config.outputAssembly
+                           << " rpi=" << config.rpiMs << "ms";
+}
+
+void RMC75EClient::unsubscribe() {
+    ioRunning_ = false;
+    if (currentIoClient == this) {
+        // Called from a listener, on the I/O thread: it can't join itself
+        // (nor wait for ioMutex_, held by a thread joining it). The loop
+        // stops when the listener returns; the next unsubscribe(),
+        // subscribe() or disconnect() from another thread joins it and
+        // closes the connection.
+        return;
+    }
+
+    // Declared before the lock: the connection is destroyed after it
+    std::shared_ptr<IOConnection> keepAlive;
+    std::lock_guard<std::mutex> ioLock(ioMutex_);
+    keepAlive = stopIo();
+}
+
+std::shared_ptr<IOConnection> RMC75EClient::stopIo() {
+    ioRunning_ = false;
+    if (ioThread_.joinable()) {
+        ioThread_.join();
+    }
+
+    // Keeps the connection (and its listener) alive until the caller has
+    // released the mutexes: destroying the listener may take the GIL, and a
+    // thread holding the GIL may be waiting for sessionMutex_
+    auto keepAlive = ioConnection_.lock();
+    {
+        std::lock_guard<std::mutex> lock(sessionMutex_);
+        if (sessionInfo_ && keepAlive) {
+            try {
+                connectionManager_.forwardClose(sessionInfo_, ioConnection_);
+            } catch (const std::exception& e) {
+                Logger(LogLevel::WARNING) << "Forward Close failed: " << e.what();
+            }
+        }
+        ioConnection_.reset();
+    }
+    return keepAlive;
+}
+
+bool RMC75EClient::isSubscribed() const {
+    return ioRunning_;
+}
+
+void RMC75EClient::ioLoop() {
+    currentIoClient = this;
+    // Short timeout so unsubscribe() is honoured promptly
+    while (ioRunning_ && connectionManager_.hasOpenConnections()) {
+        connectionManager_.handleConnections(std::chrono::milliseconds(10));
+    }
+    ioRunning_ = false;
+}
+
 std::vector<uint8_t> RMC75EClient::sendRawRequest(uint8_t service, const std::vector<uint8_t>& data) {
-    return executeRequest(service, data);
+    // The service is unknown, so it may not be safe to resend
+    return executeRequest(service, data, false);
 }
 
 // ---------------------------------------------------------------------------
@@ -152,33 +385,63 @@ std::vector<uint8_t> RMC75EClient::buildWritePayload(uint16_t file, uint16_t ele
     return payload;
 }
 
-std::vector<uint8_t> RMC75EClient::executeRequest(uint8_t service, const std::vector<uint8_t>& payload) {
+std::vector<uint8_t> RMC75EClient::executeRequest(uint8_t service, const std::vector<uint8_t>& payload,
+                                                  bool retry) {
+    return executeRequest(service, EPath(REGISTER_MAP_CLASS, REGISTER_MAP_INSTANCE), payload, retry);
+}
+
+std::vector<uint8_t> RMC75EClient::executeRequest(uint8_t service, const EPath& path,
+                                                  const std::vector<uint8_t>& payload, bool retry) {
+    auto response = sendRequest(service, path, payload, retry);
+    if (response.getGeneralStatusCode() != GeneralStatusCodes::SUCCESS) {
+        throwStatusError(service, response);
+    }
+    return response.getData();
+}
+
+MessageRouterResponse RMC75EClient::sendRequest(uint8_t service, const EPath& path,
+                                                const std::vector<uint8_t>& payload, bool retry) {
+    // One request at a time on the session: replies are matched to
+    // requests by order on the TCP stream
+    std::lock_guard<std::mutex> lock(sessionMutex_);
     if (!sessionInfo_) {
         throw std::runtime_error("Not connected - call connect() first");
     }
 
-    auto response = messageRouter_.sendRequest(
-        sessionInfo_,
-        service,
-        EPath(REGISTER_MAP_CLASS, REGISTER_MAP_INSTANCE),
-        payload);
-
-    if (response.getGeneralStatusCode() != GeneralStatusCodes::SUCCESS) {
-        std::ostringstream ss;
-        ss << "CIP request failed: service=0x" << std::hex << (int)service
-           << " status=0x" << (int)response.getGeneralStatusCode();
-
-        auto& additional = response.getAdditionalStatus();
-        if (!additional.empty()) {
-            ss << " additional=[";
-            for (size_t i = 0; i < additional.size(); i++) {
-                if (i > 0) ss << ", ";
-                ss << "0x" << additional[i];
-            }
-            ss << "]";
+    try {
+        return messageRouter_.sendRequest(sessionInfo_, service, path, payload);
+    } catch (const std::system_error& e) {
+        // Socket error or timeout: the session is gone (or out of step, a late
+        // reply would be matched to the next request). Re-register it once
+        // instead of surfacing the error for every subsequent request.
+        Logger(LogLevel::WARNING) << "Session to RMC75E lost (" << e.what()
+                                  << "), reconnecting";
+        // ~SessionInfo doesn't throw on a failed socket (patched by
+        // scripts/build_eipscanner.py), and closes it
+        sessionInfo_.reset();
+        openSession();
+        if (!retry) {
+            // The request may have reached the RMC before the error:
+            // resending a write could apply it twice
+            throw;
         }
-        throw std::runtime_error(ss.str());
+        return messageRouter_.sendRequest(sessionInfo_, service, path, payload);
     }
+}
 
-    return response.getData();
+void RMC75EClient::throwStatusError(uint8_t service, const MessageRouterResponse& response) {
+    std::ostringstream ss;
+    ss << "CIP request failed: service=0x" << std::hex << (int)service
+       << " status=0x" << (int)response.getGeneralStatusCode();
+
+    auto& additional = response.getAdditionalStatus();
+    if (!additional.empty()) {
+        ss << " additional=[";
+        for (size_t i = 0; i < additional.size(); i++) {
+            if (i > 0) ss << ", ";
+            ss << "0x" << additional[i];
+        }
+        ss << "]";
+    }
+    throw std::runtime_error(ss.str());
 }
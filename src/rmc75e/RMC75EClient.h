@@ -1,12 +1,18 @@
 #ifndef RMC75E_CLIENT_H
 #define RMC75E_CLIENT_H
 
+#include <atomic>
+#include <functional>
 #include <memory>
+#include <mutex>
 #include <string>
+#include <thread>
 #include <vector>
 #include <cstdint>
 #include "SessionInfo.h"
 #include "MessageRouter.h"
+#include "ConnectionManager.h"
+#include "cip/EPath.h"
 
 namespace rmc75e {
 
@@ -30,6 +36,40 @@ public:
     static constexpr uint8_t SVC_READ_MSB  = 0x4D;
     static constexpr uint8_t SVC_WRITE_MSB = 0x4E;
 
+    /// Message Router object (target of the Multiple Service Packet service)
+    static constexpr uint16_t MESSAGE_ROUTER_CLASS    = 0x02;
+    static constexpr uint16_t MESSAGE_ROUTER_INSTANCE = 0x01;
+    /// CIP Multiple Service Packet service code
+    static constexpr uint8_t SVC_MULTIPLE_SERVICE = 0x0A;
+    /// General status of a Multiple Service Packet reply when an embedded request failed
+    static constexpr uint8_t STATUS_EMBEDDED_SERVICE_ERROR = 0x1E;
+
+    /**
+     * @brief A contiguous block of 32-bit registers: file + element + count
+     */
+    struct RegisterRange {
+        uint16_t file;
+        uint16_t element;
+        uint16_t count;
+    };
+
+    /**
+     * @brief Parameters of a Class 1 implicit (cyclic I/O) connection
+     *
+     * The registers carried by each assembly are configured in RMCTools.
+     */
+    struct ImplicitConnectionConfig {
+        uint8_t inputAssembly;   ///< T->O (input) assembly instance
+        uint8_t outputAssembly;  ///< O->T (output) assembly instance
+        uint8_t configAssembly;  ///< Configuration assembly instance
+        uint16_t inputSize;      ///< Input assembly size in bytes
+        uint16_t outputSize;     ///< Output assembly size in bytes
+        uint32_t rpiMs;          ///< Requested packet interval in milliseconds
+    };
+
+    /// Callback invoked with the input (T->O) assembly data of each I/O packet
+    using InputDataListener = std::function<void(const std::vector<uint8_t>&)>;
+
     /**
      * @brief Constructor
      * @param plcAddress RMC75E IP address (e.g. "192.168.1.100")
@@ -40,6 +80,12 @@ public:
 
     /**
      * @brief Open an EtherNet/IP session to the RMC
+     *
+     * The session (TCP connection + RegisterSession) is kept open and reused
+     * by every read/write until disconnect(). If it is lost, the next request
+     * re-registers it; reads are then retried once, writes and raw requests
+     * are not resent (they may already have been applied) and throw.
+     *
      * @throws std::runtime_error on connection failure
      */
     void connect();
@@ -92,6 +138,47 @@ public:
      */
     void writeInt32(uint16_t file, uint16_t element, const std::vector<int32_t>& values);
 
+    /**
+     * @brief Read several register ranges in a single Multiple Service Packet
+     *
+     * Each range becomes one embedded read (0x4B) request, so N ranges cost
+     * one network round-trip instead of N.
+     *
+     * @param ranges Register ranges to read
+     * @return Raw LSB-first data for each range (4 bytes per register), in request order
+     * @throws std::invalid_argument if the packet would exceed 65535 bytes (over 5461 ranges)
+     * @throws std::runtime_error on failure
+     */
+    std::vector<std::vector<uint8_t>> readMultiple(const std::vector<RegisterRange>& ranges);
+
+    /**
+     * @brief Open a Class 1 implicit connection and receive its input data cyclically
+     *
+     * Sends a Forward Open over the current session and starts a background
+     * thread that services the connection. The listener is invoked from that
+     * thread every RPI with the input assembly data.
+     *
+     * @param config   Assembly instances, sizes and RPI of the connection
+     * @param listener Callback receiving the input assembly data
+     * @throws std::runtime_error if not connected, already subscribed, called from the
+     *         listener, or the Forward Open fails
+     */
+    void subscribe(const ImplicitConnectionConfig& config, InputDataListener listener);
+
+    /**
+     * @brief Close the implicit connection opened by subscribe() (no-op if none)
+     *
+     * May be called from the listener: delivery then stops once the listener
+     * returns, and the connection is closed by the next unsubscribe(),
+     * subscribe() or disconnect() called from another thread.
+     */
+    void unsubscribe();
+
+    /**
+     * @brief Check if an implicit connection is open
+     */
+    bool isSubscribed() const;
+
     /**
      * @brief Send a raw CIP request via the Register Map Object
      * @param service Service code (e.g. 0x4B for read LSB-first)
@@ -105,8 +192,37 @@ private:
     std::string plcAddress_;
     uint16_t port_;
     std::shared_ptr<eipScanner::SessionInfo> sessionInfo_;
+    /// Guards sessionInfo_ and serializes requests on it, so a client can be
+    /// shared between threads
+    mutable std::mutex sessionMutex_;
     eipScanner::MessageRouter messageRouter_;
 
+    /// Implicit messaging state (see subscribe())
+    /// Serializes subscribe()/unsubscribe() and guards ioThread_ and
+    /// ioConnection_. Taken before sessionMutex_, never while holding it.
+    std::mutex ioMutex_;
+    eipScanner::ConnectionManager connectionManager_;
+    eipScanner::IOConnection::WPtr ioConnection_;
+    std::thread ioThread_;
+    std::atomic<bool> ioRunning_{false};
+
+    /**
+     * @brief Create the session (TCP connect + RegisterSession). Caller holds sessionMutex_.
+     */
+    void openSession();
+
+    /**
+     * @brief Stop the I/O thread and close the implicit connection. Caller holds ioMutex_.
+     * @return The closed connection, to be released once the caller's locks are
+     *         (its listener may take the GIL when destroyed)
+     */
+    std::shared_ptr<eipScanner::IOConnection> stopIo();
+
+    /**
+     * @brief Background loop servicing the implicit connection until unsubscribe()
+     */
+    void ioLoop();
+
     /**
      * @brief Build the 6-byte request header: file(2) + element(2) + count(2)
      */
@@ -119,8 +235,30 @@ private:
 
     /**
      * @brief Execute a Register Map Object request and return the response data
+     * @param retry Resend the request once if the session is lost (reads only)
+     */
+    std::vector<uint8_t> executeRequest(uint8_t service, const std::vector<uint8_t>& payload,
+                                        bool retry);
+
+    /**
+     * @brief Execute a request against an arbitrary CIP path and return the response data
+     */
+    std::vector<uint8_t> executeRequest(uint8_t service, const eipScanner::cip::EPath& path,
+                                        const std::vector<uint8_t>& payload, bool retry);
+
+    /**
+     * @brief Send a request on the session and return the response, whatever its status
+     */
+    eipScanner::cip::MessageRouterResponse sendRequest(uint8_t service,
+                                                       const eipScanner::cip::EPath& path,
+                                                       const std::vector<uint8_t>& payload,
+                                                       bool retry);
+
+    /**
+     * @brief Throw std::runtime_error describing a failed (non-SUCCESS) response
      */
-    std::vector<uint8_t> executeRequest(uint8_t service, const std::vector<uint8_t>& payload);
+    [[noreturn]] static void throwStatusError(uint8_t service,
+                                              const eipScanner::cip::MessageRouterResponse& response);
 };
 
 } // namespace rmc75e
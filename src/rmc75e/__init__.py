@@ -5,61 +5,249 @@ Provides register read/write via the RMC's Register Map Object (class 0xC0).
 """
 
 import os
+import re
 import sys
-from pathlib import Path
+import threading
 
 from rmc75e.__about__ import __version__
 
-# Add lib directory to library search path
-_lib_dir = Path(__file__).parent / "lib"
-if _lib_dir.exists():
-    if sys.platform.startswith('linux'):
-        # Linux: LD_LIBRARY_PATH
-        os.environ['LD_LIBRARY_PATH'] = f"{_lib_dir}:{os.environ.get('LD_LIBRARY_PATH', '')}"
-    elif sys.platform == 'win32':
-        # Windows: add DLL search directory (Python 3.8+)
-        if hasattr(os, 'add_dll_directory'):
-            os.add_dll_directory(str(_lib_dir))
-        # Also add to PATH as fallback for older Python / subprocess calls
-        os.environ['PATH'] = f"{_lib_dir};{os.environ.get('PATH', '')}"
-
-# Import the C++ module - located directly in this directory
+# Platform constants, generated into wheels by hatch_build.py (never into
+# the source tree). A source checkout or editable install computes them here.
 try:
-    import importlib.util
-    _module_dir = Path(__file__).parent
-
-    # Find the compiled module (.so on Linux, .pyd on Windows)
-    # The file is named rmc75e.cpython-3XX-ARCH.so (or .pyd on Windows)
-    if sys.platform == 'win32':
-        _patterns = ["rmc75e.cpython-*.pyd", "rmc75e*.pyd",
-                      "rmc75e.cpython-*.so", "rmc75e*.so"]
+    from rmc75e._platform import IS_LINUX as _IS_LINUX
+    from rmc75e._platform import IS_WIN as _IS_WIN
+    from rmc75e._platform import NATIVE_FILENAME as _NATIVE_FILENAME
+except ImportError:
+    import importlib.machinery
+    _IS_WIN = sys.platform == 'win32'
+    _IS_LINUX = sys.platform == 'linux'
+    _NATIVE_FILENAME = f"rmc75e{importlib.machinery.EXTENSION_SUFFIXES[0]}"
+
+_module_dir = os.path.dirname(os.path.abspath(__file__))
+_lib_dir = os.path.join(_module_dir, "lib")
+_LOAD_WITH_ALTERED_SEARCH_PATH = 0x00000008
+
+# Records a module with a non-standard name found by the directory scan
+# (file name and mtime), so other processes don't have to scan again.
+# Wheels always hit the exact NATIVE_FILENAME first and never write it.
+_sidecar = os.path.join(_lib_dir, ".native_path")
+
+# Compiled module names: rmc75e.so, rmc75e.cpython-312-x86_64-linux-gnu.so,
+# rmc75e.cp312-win_amd64.pyd, rmc75e.abi3.so, ... (.so only on Linux).
+# Compiled once for this platform, so the scan is a single match per entry.
+_EXT_RE = re.compile(r"rmc75e(\.[^.]+)?\.(pyd|so)$" if _IS_WIN
+                     else r"rmc75e(\.[^.]+)?\.(so)$")
+
+# Shared libraries bundled in lib/: foo.dll, libfoo.so, libfoo.so.1.2, ...
+_LIB_RE = re.compile(r".+\.(dll|dylib|so(\.\d+)*)$", re.IGNORECASE)
+
+# Other file names seen by the directory scan (for the error message)
+_files = []
+
+
+def _scan_lib_dir():
+    """Shared libraries in lib/ (one directory pass), empty if there are none.
+
+    Other files (e.g. the .native_path sidecar) don't count.
+    """
+    try:
+        with os.scandir(_lib_dir) as it:
+            return sorted(entry.name for entry in it if _LIB_RE.match(entry.name))
+    except FileNotFoundError:
+        return []
+
+
+def _setup_lib_dir(lib_names):
+    """Make the bundled libraries in lib/ resolvable by the extension.
+
+    Linux needs nothing here: the extension is linked with rpath $ORIGIN/lib
+    (LD_LIBRARY_PATH is only read at process start, so setting it would just
+    leak into child processes).
+    Windows doesn't use PATH for this either: it is ignored by the DLL loader
+    on Python 3.8+ and would leak into child processes.
+    """
+    if not lib_names or not _IS_WIN:
+        # Nothing bundled: don't add a search directory for the
+        # lifetime of the process
+        return
+    if sys.version_info >= (3, 8):
+        # Windows, Python 3.8+: add DLL search directory
+        os.add_dll_directory(_lib_dir)
     else:
-        _patterns = ["rmc75e.cpython-*.so", "rmc75e*.so"]
-
-    _found = False
-    for _pattern in _patterns:
-        for _ext_file in _module_dir.glob(_pattern):
-            if _ext_file.is_file():
-                # Use a distinct name to avoid conflict with this package
-                spec = importlib.util.spec_from_file_location(
-                    "_rmc75e_native", _ext_file)
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    RMC75EClient = module.RMC75EClient
-                    _found = True
-                    break
-        if _found:
-            break
-
-    if not _found:
-        ext = ".pyd/.so" if sys.platform == 'win32' else ".so"
-        _files = [f.name for f in _module_dir.iterdir() if f.is_file()]
-        raise ImportError(
-            f"Compiled rmc75e native module not found ({ext}) "
-            f"in {_module_dir}. Files present: {_files}")
-
-except ImportError as e:
-    raise ImportError(f"Error loading rmc75e module: {e}")
+        # Older Python: load the bundled DLLs by absolute path (their own
+        # dependencies are searched next to them); the extension's imports
+        # then resolve to these already loaded modules
+        import ctypes
+        for name in lib_names:
+            if name.lower().endswith(".dll"):
+                ctypes.windll.kernel32.LoadLibraryExW(
+                    os.path.join(_lib_dir, name), None, _LOAD_WITH_ALTERED_SEARCH_PATH)
+
+
+def _preload_bundled_libs(lib_names):
+    """Load lib/*.so* globally so the extension's DT_NEEDED resolve.
+
+    Returns True if anything was loaded. Linux only; real files are
+    loaded (versioned names first), the soname symlinks point at them.
+    """
+    if not _IS_LINUX or not lib_names:
+        return False
+    import ctypes
+    libs = sorted((name for name in lib_names if ".so" in name
+                   and not os.path.islink(os.path.join(_lib_dir, name))),
+                  key=lambda name: (name.endswith(".so"), name))
+    loaded = False
+    for lib in libs:
+        try:
+            ctypes.CDLL(os.path.join(_lib_dir, lib), mode=os.RTLD_NOW | os.RTLD_GLOBAL)
+            loaded = True
+        except OSError:
+            pass
+    return loaded
+
+
+def _read_sidecar():
+    """Return the module recorded in the sidecar, if it is still valid."""
+    try:
+        with open(_sidecar) as f:
+            name, mtime = f.read().split("\n")[:2]
+        path = os.path.join(_module_dir, name)
+        if os.stat(path).st_mtime_ns == int(mtime):
+            return path
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _write_sidecar(path):
+    """Record a scanned module in the sidecar (atomically)."""
+    tmp = f"{_sidecar}.{os.getpid()}"
+    try:
+        with open(tmp, "w") as f:
+            f.write(f"{os.path.basename(path)}\n{os.stat(path).st_mtime_ns}\n")
+        os.replace(tmp, _sidecar)
+    except OSError:
+        # Read-only install or no lib/: just scan next time
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _scan_module_dir():
+    """Return the compiled modules in the package directory, best first.
+
+    A single directory pass, which also records the names of the other
+    files, so a failed import can report them without listing again.
+    """
+    matches = []
+    _files.clear()
+    with os.scandir(_module_dir) as it:
+        for entry in it:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            match = _EXT_RE.match(entry.name)
+            if match:
+                # .pyd before .so, then ABI-tagged names
+                matches.append((match.group(2) != "pyd",
+                                match.group(1) is None, entry.name))
+            else:
+                _files.append(entry.name)
+    return [os.path.join(_module_dir, name) for *_, name in sorted(matches)]
+
+
+def _find_ext_files():
+    """Yield (candidate compiled module, found by scan), cheapest first."""
+    # The binding is built as rmc75e + EXT_SUFFIX of the interpreter
+    # (e.g. rmc75e.cpython-312-x86_64-linux-gnu.so): a single stat in the
+    # common case. It is loaded from disk rather than from memory (memfd,
+    # LoadLibrary-from-memory): its dependencies in lib/ are found relative
+    # to its own path ($ORIGIN rpath, add_dll_directory).
+    yield os.path.join(_module_dir, _NATIVE_FILENAME), False
+
+    cached = _read_sidecar()
+    if cached is not None:
+        yield cached, False
+
+    # Fallback for other layouts: scan for .so on Linux, .pyd on Windows
+    for path in _scan_module_dir():
+        yield path, True
+
+
+# Serializes _load_native(): it runs from __getattr__, outside the import lock
+_load_lock = threading.Lock()
+
+
+def _load_native():
+    """Return the C++ module, loading it on first use (thread-safe)."""
+    with _load_lock:
+        # Checked under the lock: the module is in sys.modules before it is
+        # fully initialised. Already loaded in this interpreter (the package
+        # was reloaded or re-imported): reuse it, an extension can't be
+        # loaded twice anyway
+        module = sys.modules.get("rmc75e.rmc75e")
+        if module is not None:
+            return module
+        return _find_and_load_native()
+
+
+def _find_and_load_native():
+    """Import the C++ module - located directly in this directory.
+
+    Caller holds _load_lock.
+    """
+    lib_names = _scan_lib_dir()
+    _setup_lib_dir(lib_names)
+
+    for ext_file, scanned in _find_ext_files():
+        if not os.path.isfile(ext_file):
+            continue
+
+        import importlib.util
+        # The name must end in "rmc75e" to match the extension's
+        # PyInit_rmc75e entry point
+        spec = importlib.util.spec_from_file_location("rmc75e.rmc75e", ext_file)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"{ext_file} is not a loadable extension module")
+        try:
+            module = importlib.util.module_from_spec(spec)
+        except ImportError:
+            # The rpath wasn't honoured (e.g. the extension was
+            # relocated or patched): load the bundled libraries by
+            # path and try once more
+            if not _preload_bundled_libs(lib_names):
+                raise
+            module = importlib.util.module_from_spec(spec)
+        # Registered like a regular submodule: the import system
+        # requires it for multi-phase init, and it makes the
+        # classes' __module__ ("rmc75e.rmc75e") importable (pickle)
+        sys.modules[spec.name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[spec.name]
+            raise
+        if scanned and os.path.basename(ext_file) != _NATIVE_FILENAME:
+            _write_sidecar(ext_file)
+        return module
+
+    # Every candidate failed, so the directory scan has run
+    ext = ".pyd/.so" if _IS_WIN else ".so"
+    raise ImportError(
+        f"Compiled rmc75e native module not found ({ext}) "
+        f"in {_module_dir}. Files present: {_files}")
+
+
+def __getattr__(name):
+    """Load the native module on first use of RMC75EClient (PEP 562).
+
+    ``import rmc75e`` only needs the pure Python parts, e.g. for
+    ``__version__``; ``from rmc75e import RMC75EClient`` works as usual.
+    """
+    if name == "RMC75EClient":
+        client = globals()["RMC75EClient"] = _load_native().RMC75EClient
+        return client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["RMC75EClient", "__version__"]
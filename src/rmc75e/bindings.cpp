@@ -7,6 +7,9 @@
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <memory>
+#include <string>
+#include <tuple>
 #include "RMC75EClient.h"
 
 namespace py = pybind11;
@@ -16,10 +19,107 @@ using namespace rmc75e;
 #define RMC75E_VERSION "0.0.0"
 #endif
 
+/// (file, element, type, count) as passed to read_multi()
+using MultiReadRequest = std::tuple<uint16_t, uint16_t, std::string, uint16_t>;
+
+/// Deletes the client with the GIL released, so the implicit messaging thread
+/// can finish a pending Python callback while it is being joined.
+struct ReleaseGilDeleter {
+    void operator()(RMC75EClient* client) const {
+        py::gil_scoped_release release;
+        delete client;
+    }
+};
+
+/// array.array, looked up once at module init. The reference is kept for the
+/// lifetime of the process (never released after interpreter shutdown).
+static py::handle arrayType;
+
+/// Wrap 32-bit register values in an array.array: one buffer for all the
+/// values instead of one Python float/int object per register. frombytes()
+/// reads a memoryview of the C++ buffer, so the values are copied once.
+static py::object toArray(const char* typecode, const void* data, size_t size) {
+    py::object values = arrayType(typecode);
+    values.attr("frombytes")(py::memoryview::from_memory(data, static_cast<py::ssize_t>(size)));
+    return values;
+}
+
+// Network calls run with the GIL released, so other Python threads (or an
+// asyncio loop using run_in_executor/to_thread) keep running meanwhile.
+
+static py::object readFloat(RMC75EClient& self, uint16_t file, uint16_t element, uint16_t count) {
+    std::vector<float> values;
+    {
+        py::gil_scoped_release release;
+        values = self.readFloat(file, element, count);
+    }
+    return toArray("f", values.data(), values.size() * sizeof(float));
+}
+
+static py::object readInt32(RMC75EClient& self, uint16_t file, uint16_t element, uint16_t count) {
+    std::vector<int32_t> values;
+    {
+        py::gil_scoped_release release;
+        values = self.readInt32(file, element, count);
+    }
+    return toArray("i", values.data(), values.size() * sizeof(int32_t));
+}
+
+static py::list readMulti(RMC75EClient& self, const std::vector<MultiReadRequest>& requests) {
+    std::vector<RMC75EClient::RegisterRange> ranges;
+    ranges.reserve(requests.size());
+    for (const auto& req : requests) {
+        const auto& type = std::get<2>(req);
+        if (type != "float" && type != "int32") {
+            throw py::value_error("Unsupported register type '" + type +
+                                  "' (expected 'float' or 'int32')");
+        }
+        ranges.push_back({std::get<0>(req), std::get<1>(req), std::get<3>(req)});
+    }
+
+    std::vector<std::vector<uint8_t>> raw;
+    {
+        py::gil_scoped_release release;
+        raw = self.readMultiple(ranges);
+    }
+
+    py::list result;
+    for (size_t i = 0; i < raw.size(); i++) {
+        const char* typecode = std::get<2>(requests[i]) == "float" ? "f" : "i";
+        result.append(toArray(typecode, raw[i].data(), raw[i].size()));
+    }
+    return result;
+}
+
+static void subscribe(RMC75EClient& self, py::function callback,
+                      uint8_t inputAssembly, uint8_t outputAssembly, uint8_t configAssembly,
+                      uint16_t inputSize, uint16_t outputSize, uint32_t rpiMs) {
+    // The last reference may be dropped on the I/O thread: take the GIL there
+    std::shared_ptr<py::function> cb(new py::function(std::move(callback)),
+        [](py::function* f) {
+            py::gil_scoped_acquire gil;
+            delete f;
+        });
+
+    py::gil_scoped_release release;
+    self.subscribe(
+        {inputAssembly, outputAssembly, configAssembly, inputSize, outputSize, rpiMs},
+        [cb](const std::vector<uint8_t>& data) {
+            py::gil_scoped_acquire gil;
+            try {
+                (*cb)(py::bytes(reinterpret_cast<const char*>(data.data()), data.size()));
+            } catch (py::error_already_set& e) {
+                e.discard_as_unraisable("RMC75EClient.subscribe callback");
+            }
+        });
+}
+
 PYBIND11_MODULE(rmc75e, m) {
     m.doc() = "EtherNet/IP explicit messaging client for Delta RMC75E motion controllers";
 
-    py::class_<RMC75EClient>(m, "RMC75EClient",
+    arrayType = py::object(py::module_::import("array").attr("array")).release();
+
+    py::class_<RMC75EClient, std::unique_ptr<RMC75EClient, ReleaseGilDeleter>>(m, "RMC75EClient",
         "EtherNet/IP explicit messaging client for Delta RMC75E controllers.\n\n"
         "Provides register read/write via the RMC's Register Map Object (class 0xC0).\n"
         "Service codes 0x4B/0x4C use LSB-first byte order.")
@@ -31,16 +131,35 @@ PYBIND11_MODULE(rmc75e, m) {
             "    plc_address: RMC75E IP address (e.g. '192.168.1.100')\n"
             "    port: EtherNet/IP port (default 44818)")
         .def("connect", &RMC75EClient::connect,
+            py::call_guard<py::gil_scoped_release>(),
             "Open an EtherNet/IP session to the RMC75E.\n\n"
             "Raises:\n"
             "    RuntimeError: If connection fails")
         .def("disconnect", &RMC75EClient::disconnect,
-            "Close the EtherNet/IP session.")
+            py::call_guard<py::gil_scoped_release>(),
+            "Close the EtherNet/IP session (and the implicit connection, if any).")
+        .def("__enter__",
+            [](RMC75EClient& self) -> RMC75EClient& {
+                py::gil_scoped_release release;
+                if (!self.isConnected()) {
+                    self.connect();
+                }
+                return self;
+            },
+            py::return_value_policy::reference,
+            "Connect (if not already connected) and return the client.")
+        .def("__exit__",
+            [](RMC75EClient& self, py::object, py::object, py::object) {
+                py::gil_scoped_release release;
+                self.disconnect();
+            },
+            "Disconnect when leaving a with block.")
         .def("is_connected", &RMC75EClient::isConnected,
+            py::call_guard<py::gil_scoped_release>(),
             "Check if connected to the RMC75E.\n\n"
             "Returns:\n"
             "    True if connected, False otherwise")
-        .def("read_float", &RMC75EClient::readFloat,
+        .def("read_float", &readFloat,
             py::arg("file"), py::arg("element"), py::arg("count"),
             "Read floating-point registers from the RMC.\n\n"
             "Args:\n"
@@ -48,10 +167,11 @@ PYBIND11_MODULE(rmc75e, m) {
             "    element: Element offset within the file\n"
             "    count: Number of 32-bit float values to read\n\n"
             "Returns:\n"
-            "    List of float values\n\n"
+            "    array.array('f') of float values\n\n"
             "Raises:\n"
             "    RuntimeError: If the read fails")
         .def("write_float", &RMC75EClient::writeFloat,
+            py::call_guard<py::gil_scoped_release>(),
             py::arg("file"), py::arg("element"), py::arg("values"),
             "Write floating-point registers to the RMC.\n\n"
             "Args:\n"
@@ -60,7 +180,7 @@ PYBIND11_MODULE(rmc75e, m) {
             "    values: List of float values to write\n\n"
             "Raises:\n"
             "    RuntimeError: If the write fails")
-        .def("read_int32", &RMC75EClient::readInt32,
+        .def("read_int32", &readInt32,
             py::arg("file"), py::arg("element"), py::arg("count"),
             "Read 32-bit integer registers from the RMC.\n\n"
             "Args:\n"
@@ -68,10 +188,11 @@ PYBIND11_MODULE(rmc75e, m) {
             "    element: Element offset within the file\n"
             "    count: Number of 32-bit integer values to read\n\n"
             "Returns:\n"
-            "    List of int32 values\n\n"
+            "    array.array('i') of int32 values\n\n"
             "Raises:\n"
             "    RuntimeError: If the read fails")
         .def("write_int32", &RMC75EClient::writeInt32,
+            py::call_guard<py::gil_scoped_release>(),
             py::arg("file"), py::arg("element"), py::arg("values"),
             "Write 32-bit integer registers to the RMC.\n\n"
             "Args:\n"
@@ -80,7 +201,57 @@ PYBIND11_MODULE(rmc75e, m) {
             "    values: List of int32 values to write\n\n"
             "Raises:\n"
             "    RuntimeError: If the write fails")
+        .def("read_multi", &readMulti,
+            py::arg("requests"),
+            "Read several register ranges in a single request.\n\n"
+            "All ranges are sent in one CIP Multiple Service Packet (0x0A), so\n"
+            "N ranges cost one network round-trip instead of N.\n\n"
+            "Args:\n"
+            "    requests: List of (file, element, type, count) tuples, where\n"
+            "        type is 'float' or 'int32'\n\n"
+            "Returns:\n"
+            "    List with one array.array of values per request ('f' for float,\n"
+            "    'i' for int32), in request order\n\n"
+            "Raises:\n"
+            "    ValueError: If a register type is not supported\n"
+            "    RuntimeError: If the read fails")
+        .def("subscribe", &subscribe,
+            py::arg("callback"),
+            py::arg("input_assembly"),
+            py::arg("output_assembly"),
+            py::arg("config_assembly"),
+            py::arg("input_size"),
+            py::arg("output_size") = 0,
+            py::arg("rpi_ms") = 10,
+            "Open a Class 1 implicit (cyclic I/O) connection.\n\n"
+            "The RMC75E pushes the input assembly every RPI, without a request\n"
+            "per sample. The registers carried by each assembly are configured\n"
+            "in RMCTools.\n\n"
+            "Args:\n"
+            "    callback: Called as callback(data) with the input assembly bytes,\n"
+            "        from a background thread. It may call unsubscribe() or\n"
+            "        disconnect() to stop the delivery\n"
+            "    input_assembly: T->O (input) assembly instance\n"
+            "    output_assembly: O->T (output) assembly instance\n"
+            "    config_assembly: Configuration assembly instance\n"
+            "    input_size: Input assembly size in bytes\n"
+            "    output_size: Output assembly size in bytes (default 0)\n"
+            "    rpi_ms: Requested packet interval in milliseconds (default 10)\n\n"
+            "Raises:\n"
+            "    RuntimeError: If not connected, already subscribed, called from\n"
+            "        the callback, or the Forward Open fails")
+        .def("unsubscribe", &RMC75EClient::unsubscribe,
+            py::call_guard<py::gil_scoped_release>(),
+            "Close the implicit connection opened by subscribe().\n\n"
+            "When called from the subscribe() callback, delivery stops once the\n"
+            "callback returns; the connection is closed by the next\n"
+            "unsubscribe() or disconnect() from another thread.")
+        .def("is_subscribed", &RMC75EClient::isSubscribed,
+            "Check if an implicit connection is open.\n\n"
+            "Returns:\n"
+            "    True if subscribed, False otherwise")
         .def("send_raw_request", &RMC75EClient::sendRawRequest,
+            py::call_guard<py::gil_scoped_release>(),
             py::arg("service"), py::arg("data"),
             "Send a raw CIP request via the Register Map Object.\n\n"
             "Args:\n"